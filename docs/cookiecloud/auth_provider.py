@@ -8,17 +8,19 @@
 - 静态配置降级
 """
 
+import threading
 import time
+from contextlib import suppress
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
 
 from ..log import logger
 from ..notifier import send_failure
 from .cache import AuthCache, CachedAuth
-from .cookie_cloud import CookieCloudClient
+from .cookie_cloud import CookieCloudClient, domain_variants
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AuthCredentials:
     """认证凭据"""
 
@@ -47,6 +49,9 @@ class AuthProvider:
         ```
     """
 
+    # 静态配置无过期时间，内存缓存使用较短的 TTL
+    STATIC_AUTH_TTL_SECONDS = 60
+
     def __init__(self, config: dict, cache_path: str = "./data/cookie_cache.json"):
         """
         初始化认证提供者。
@@ -58,6 +63,14 @@ class AuthProvider:
         self.config = config
         self.cache = AuthCache(cache_path)
 
+        # 内存缓存: (时钟, 有效截止时间点, 认证凭据)，避免每次调用都读取缓存文件
+        # JWT 过期时间是墙上时间，使用 time.time；静态配置的短 TTL 使用 time.monotonic
+        self._mem_cache: Optional[
+            tuple[Callable[[], float], float, AuthCredentials]
+        ] = None
+        # 缓存失效时只允许一个线程刷新，避免并发请求 CookieCloud
+        self._refresh_lock = threading.Lock()
+
         # 初始化 CookieCloud 客户端（如果配置了）
         self._cookie_cloud: Optional[CookieCloudClient] = None
 
@@ -70,6 +83,9 @@ class AuthProvider:
             )
             self._target_domain = cc_config.get("target_domain", ".duolainc.com")
 
+            # 预先计算带/不带前导点的候选域名，避免每次获取时重复拼接
+            self._target_domains = domain_variants(self._target_domain)
+
     def is_cookiecloud_enabled(self) -> bool:
         """检查 CookieCloud 是否启用"""
         return self._cookie_cloud is not None
@@ -88,48 +104,71 @@ class AuthProvider:
         Raises:
             ValueError: 静态配置也不可用时抛出
         """
+        # 0. 检查内存缓存
+        auth = self._get_mem_cached()
+        if auth:
+            return auth
+
         # CookieCloud 未启用，直接使用静态配置
         if not self.is_cookiecloud_enabled():
             logger.debug("CookieCloud 未启用，使用静态配置")
-            return self._get_static_auth()
-
-        # 1. 检查本地缓存
-        cached = self.cache.load()
-        if cached and self.cache.is_valid(cached):
-            logger.info("使用本地缓存的认证信息")
-            return AuthCredentials(
-                authorization=cached.authorization,
-                cookie=cached.cookie_string,
-            )
-
-        # 2. 从 CookieCloud 获取
-        try:
-            auth = self._fetch_from_cookiecloud()
-
-            # 保存到缓存
-            self._save_to_cache(auth)
-
-            return auth
-
-        except Exception as e:
-            logger.error(f"CookieCloud 获取失败: {e}")
-
-            # 发送告警通知（使用全局企微通知器）
-            send_failure(
-                title="IM Parser 认证告警",
-                error_message=f"**来源**: CookieCloud\n**详情**: {e}\n**状态**: 已降级到静态配置",
-                suggestions=[
-                    "检查 CookieCloud 服务状态",
-                    "确认浏览器已登录 duolainc.com",
-                    "手动同步 CookieCloud 数据",
-                    "检查 config.yaml 静态配置是否有效",
-                ],
-                mention_all=True,
-            )
+            return self._remember_static(self._get_static_auth())
+
+        # 只允许一个线程执行刷新，其他线程等待并复用其结果
+        with self._refresh_lock:
+            # 等待锁期间可能已有其他线程完成刷新
+            auth = self._get_mem_cached()
+            if auth:
+                return auth
+
+            # 1. 检查本地缓存
+            cached = self.cache.load()
+            if cached and self.cache.is_valid(cached):
+                logger.info("使用本地缓存的认证信息")
+                auth = AuthCredentials(
+                    authorization=cached.authorization,
+                    cookie=cached.cookie_string,
+                )
+                self._remember(auth, cached.jwt_exp)
+                return auth
+
+            # 2. 从 CookieCloud 获取
+            try:
+                auth, jwt_exp = self._fetch_from_cookiecloud()
+
+                # 保存到缓存
+                self._save_to_cache(auth, jwt_exp)
+
+                self._remember(auth, jwt_exp)
+                return auth
+
+            except Exception as e:
+                logger.error("CookieCloud 获取失败: {}", e)
+                error = e
+
+                # 3. 降级到静态配置：锁内只写入内存缓存，让等待的线程直接复用
+                fallback = None
+                with suppress(ValueError):
+                    fallback = self._remember_static(self._get_static_auth())
+
+        # 发送告警通知（使用全局企微通知器），在锁外执行，避免阻塞其他线程
+        send_failure(
+            title="IM Parser 认证告警",
+            error_message=f"**来源**: CookieCloud\n**详情**: {error}\n**状态**: 已降级到静态配置",
+            suggestions=[
+                "检查 CookieCloud 服务状态",
+                "确认浏览器已登录 duolainc.com",
+                "手动同步 CookieCloud 数据",
+                "检查 config.yaml 静态配置是否有效",
+            ],
+            mention_all=True,
+        )
 
-            # 3. 降级到静态配置
-            logger.warning("降级到静态配置")
-            return self._get_static_auth()
+        logger.warning("降级到静态配置")
+        if fallback is None:
+            # 静态配置不可用，重新获取以抛出 ValueError
+            fallback = self._get_static_auth()
+        return fallback
 
     def refresh(self, force: bool = False) -> AuthCredentials:
         """
@@ -143,14 +182,49 @@ class AuthProvider:
         """
         if force:
             logger.info("强制刷新认证信息，清除缓存")
-            self.cache.invalidate()
+            self.invalidate()
 
         return self.get_auth()
 
     def invalidate(self) -> None:
-        """使缓存失效"""
+        """使缓存失效（包括内存缓存和本地缓存文件）"""
+        self._mem_cache = None
         self.cache.invalidate()
 
+    def _get_mem_cached(self) -> Optional[AuthCredentials]:
+        """获取内存缓存中未过期的认证凭据"""
+        mem_cache = self._mem_cache  # 读取一次，避免与 invalidate() 并发时出错
+        if mem_cache and mem_cache[0]() < mem_cache[1]:
+            return mem_cache[2]
+        return None
+
+    def _remember(self, auth: AuthCredentials, jwt_exp: int) -> None:
+        """
+        将认证凭据写入内存缓存。
+
+        与本地缓存一致，提前 REFRESH_BUFFER_SECONDS 判定为过期。
+
+        Args:
+            auth: 认证凭据
+            jwt_exp: JWT 过期时间戳（秒）
+        """
+        refresh_at = jwt_exp - AuthCache.REFRESH_BUFFER_SECONDS
+        self._mem_cache = (time.time, refresh_at, auth)
+
+    def _remember_static(self, auth: AuthCredentials) -> AuthCredentials:
+        """
+        将静态配置的认证凭据写入内存缓存（短 TTL）。
+
+        Args:
+            auth: 认证凭据
+
+        Returns:
+            传入的认证凭据
+        """
+        expire_at = time.monotonic() + self.STATIC_AUTH_TTL_SECONDS
+        self._mem_cache = (time.monotonic, expire_at, auth)
+        return auth
+
     def _get_static_auth(self) -> AuthCredentials:
         """
         从静态配置获取认证信息。
@@ -172,12 +246,12 @@ class AuthProvider:
 
         return AuthCredentials(authorization=authorization, cookie=cookie)
 
-    def _fetch_from_cookiecloud(self) -> AuthCredentials:
+    def _fetch_from_cookiecloud(self) -> tuple[AuthCredentials, int]:
         """
         从 CookieCloud 获取认证信息。
 
         Returns:
-            AuthCredentials
+            (AuthCredentials, JWT 过期时间戳)
 
         Raises:
             Exception: 获取或解析失败时抛出
@@ -185,34 +259,25 @@ class AuthProvider:
         if not self._cookie_cloud:
             raise RuntimeError("CookieCloud 未配置")
 
-        parsed = self._cookie_cloud.fetch_cookies(self._target_domain)
+        parsed = self._cookie_cloud.fetch_cookies(self._target_domains)
 
-        return AuthCredentials(
+        auth = AuthCredentials(
             authorization=parsed.authorization,
             cookie=parsed.cookie_string,
         )
+        return auth, parsed.jwt_exp
 
-    def _save_to_cache(self, auth: AuthCredentials) -> None:
+    def _save_to_cache(self, auth: AuthCredentials, jwt_exp: int) -> None:
         """
         保存认证信息到缓存。
 
         Args:
             auth: 认证凭据
+            jwt_exp: JWT 过期时间戳（秒），由 CookieCloud 解析时得到
         """
         if not self._cookie_cloud:
             return
 
-        # 从 CookieCloud 最后一次获取的数据中提取 jwt_exp
-        # 这里需要重新解析 JWT 来获取 exp
-        from .cookie_cloud import CookieCloudClient
-
-        client = CookieCloudClient("", "", "")  # 只用于解析
-        jwt_exp = client._extract_jwt_exp(auth.authorization)
-
-        if not jwt_exp:
-            logger.warning("无法提取 JWT 过期时间，跳过缓存")
-            return
-
         cached = CachedAuth(
             version=AuthCache.CACHE_VERSION,
             created_at=time.time(),
@@ -6,15 +6,74 @@
 """
 
 import json
+import mmap
+import os
+import tempfile
 import time
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from ..log import logger
 
+# 优先使用 orjson（C 实现，直接处理 bytes），未安装时回退到标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+# 缓存文件默认紧凑输出；设置 AUTH_CACHE_PRETTY=1 时缩进输出，便于人工查看
+_PRETTY = os.environ.get("AUTH_CACHE_PRETTY") == "1"
+
+
+def _json_loads(data: Union[bytes, memoryview]) -> dict:
+    """将 bytes / memoryview 解析为 JSON 对象"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def _json_dumps(obj: dict) -> bytes:
+    """将对象序列化为 UTF-8 编码的 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if _PRETTY else None)
+    if _PRETTY:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _read_json_file(path: str) -> dict:
+    """
+    读取并解析 JSON 文件。
+
+    优先通过 mmap 将文件映射到内存后直接解析，省去 read() 的额外拷贝；
+    平台或文件系统不支持 mmap 时回退到普通读取。
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        解析后的 JSON 对象
+
+    Raises:
+        FileNotFoundError: 文件不存在
+        ValueError: 文件为空或 JSON 格式错误
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法 mmap
+            raise ValueError("缓存文件为空") from None
+        except OSError:
+            return _json_loads(f.read())
+
+        # 先释放 memoryview 再关闭 mmap，否则 close() 会抛出 BufferError
+        with mm, memoryview(mm) as view:
+            return _json_loads(view)
+
+
+@dataclass(slots=True, frozen=True)
 class CachedAuth:
     """缓存的认证信息"""
 
@@ -23,6 +82,16 @@ class CachedAuth:
     jwt_exp: int  # JWT 过期时间戳（秒）
     authorization: str  # JWT token
     cookie_string: str  # 完整 cookie 字符串
+    # 需要刷新的时间点（时间戳），由 jwt_exp 预先计算，不写入缓存文件
+    refresh_at: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        refresh_at = self.jwt_exp - AuthCache.REFRESH_BUFFER_SECONDS
+        object.__setattr__(self, "refresh_at", refresh_at)
+
+
+# 需要写入缓存文件的字段（排除 refresh_at 等派生字段）
+_PERSISTED_FIELDS = tuple(f.name for f in fields(CachedAuth) if f.init)
 
 
 class AuthCache:
@@ -48,6 +117,10 @@ class AuthCache:
         """
         self.cache_path = Path(cache_path)
 
+        # 路径固定不变，预先转换为字符串，避免每次操作都经过 pathlib
+        self._path_str = str(self.cache_path)
+        self._parent_str = str(self.cache_path.parent)
+
     def load(self) -> Optional[CachedAuth]:
         """
         从文件加载缓存。
@@ -55,18 +128,13 @@ class AuthCache:
         Returns:
             CachedAuth 实例，文件不存在或格式错误时返回 None
         """
-        if not self.cache_path.exists():
-            logger.debug(f"缓存文件不存在: {self.cache_path}")
-            return None
-
         try:
-            with open(self.cache_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = _read_json_file(self._path_str)
 
             # 检查版本兼容性
             if data.get("version") != self.CACHE_VERSION:
                 logger.warning(
-                    f"缓存版本不匹配: {data.get('version')} != {self.CACHE_VERSION}"
+                    "缓存版本不匹配: {} != {}", data.get("version"), self.CACHE_VERSION
                 )
                 return None
 
@@ -77,11 +145,15 @@ class AuthCache:
                 authorization=data["authorization"],
                 cookie_string=data["cookie_string"],
             )
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.warning(f"缓存文件格式错误: {e}")
+        except FileNotFoundError:
+            logger.debug("缓存文件不存在: {}", self.cache_path)
+            return None
+        # orjson.JSONDecodeError 与 json.JSONDecodeError 均为 ValueError 子类
+        except (ValueError, KeyError) as e:
+            logger.warning("缓存文件格式错误: {}", e)
             return None
         except Exception as e:
-            logger.error(f"加载缓存失败: {e}")
+            logger.error("加载缓存失败: {}", e)
             return None
 
     def save(self, auth: CachedAuth) -> bool:
@@ -94,17 +166,32 @@ class AuthCache:
         Returns:
             是否保存成功
         """
+        tmp_path = None
+
         try:
             # 确保目录存在
-            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            os.makedirs(self._parent_str, exist_ok=True)
 
-            with open(self.cache_path, "w", encoding="utf-8") as f:
-                json.dump(asdict(auth), f, ensure_ascii=False, indent=2)
+            data = {name: getattr(auth, name) for name in _PERSISTED_FIELDS}
 
-            logger.info(f"认证缓存已保存: {self.cache_path}")
+            # 先写入临时文件再原子替换，避免读取到写了一半的缓存；
+            # 临时文件名唯一，多进程/多线程同时保存时互不覆盖
+            fd, tmp_path = tempfile.mkstemp(dir=self._parent_str, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(_json_dumps(data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path_str)
+
+            logger.info("认证缓存已保存: {}", self.cache_path)
             return True
         except Exception as e:
-            logger.error(f"保存缓存失败: {e}")
+            logger.error("保存缓存失败: {}", e)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
             return False
 
     def is_valid(self, cached: CachedAuth) -> bool:
@@ -119,16 +206,16 @@ class AuthCache:
         Returns:
             是否有效
         """
-        current_time = time.time()
-        expire_time = cached.jwt_exp - self.REFRESH_BUFFER_SECONDS
+        remaining = cached.refresh_at - time.time()
 
-        if current_time > expire_time:
-            remaining = cached.jwt_exp - current_time
-            logger.info(f"缓存已过期或即将过期，剩余 {remaining:.0f} 秒")
+        if remaining < 0:
+            logger.info(
+                "缓存已过期或即将过期，剩余 {:.0f} 秒",
+                remaining + self.REFRESH_BUFFER_SECONDS,
+            )
             return False
 
-        remaining = expire_time - current_time
-        logger.debug(f"缓存有效，距离刷新还有 {remaining:.0f} 秒")
+        logger.debug("缓存有效，距离刷新还有 {:.0f} 秒", remaining)
         return True
 
     def invalidate(self) -> bool:
@@ -139,10 +226,11 @@ class AuthCache:
             是否成功
         """
         try:
-            if self.cache_path.exists():
-                self.cache_path.unlink()
-                logger.info(f"缓存已清除: {self.cache_path}")
+            os.unlink(self._path_str)
+            logger.info("缓存已清除: {}", self.cache_path)
+            return True
+        except FileNotFoundError:
             return True
         except Exception as e:
-            logger.error(f"清除缓存失败: {e}")
+            logger.error("清除缓存失败: {}", e)
             return False
@@ -7,13 +7,78 @@ CookieCloud 客户端封装
 
 import base64
 import json
+import re
+import warnings
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import PurePosixPath
+from typing import Optional, Union
+from urllib.parse import urljoin, urlparse
 
 from ..log import logger
 
+# 可选依赖，未安装时不影响其他功能（fetch_cookies 调用时再报错）
+try:
+    import requests
+    import urllib3
+    from PyCookieCloud import PyCookieCloud
+except ImportError:
+    PyCookieCloud = None
 
-@dataclass
+# 认证 token 所在的 cookie 名称
+PROD_AUTH_TOKEN = "PROD_AUTH_TOKEN"
+
+
+def domain_variants(domain: str) -> tuple[str, str]:
+    """
+    生成域名及其带/不带前导点的变体。
+
+    Args:
+        domain: 目标域名，如 .duolainc.com 或 duolainc.com
+
+    Returns:
+        (目标域名, 变体域名)
+    """
+    if domain.startswith("."):
+        return (domain, domain[1:])
+    return (domain, "." + domain)
+
+
+if PyCookieCloud is not None:
+
+    class _SessionCookieCloud(PyCookieCloud):
+        """
+        通过指定 requests Session 发起请求的 PyCookieCloud。
+
+        PyCookieCloud 内部直接调用 requests.get，无法注入 Session。这里覆盖
+        get_decrypted_data 用到的两个 HTTP 方法，改用复用连接池的 Session，
+        无需全局 monkey-patch requests。
+        """
+
+        def __init__(self, url: str, uuid: str, password: str, session):
+            super().__init__(url, uuid, password)
+            self._session = session
+
+        def check_connection(self) -> bool:
+            try:
+                # 显式传入 verify=False：设置了 REQUESTS_CA_BUNDLE 等环境变量时，
+                # requests 会用 CA 证书路径覆盖 session.verify
+                response = self._session.get(self.url, verify=False)
+                return response.status_code == 200
+            except Exception:
+                return False
+
+        def get_encrypted_data(self) -> Optional[str]:
+            if not self.check_connection():
+                return None
+
+            path = str(PurePosixPath(self.api_root, "get/", self.uuid))
+            response = self._session.get(urljoin(self.url, path), verify=False)
+            if response.status_code != 200:
+                return None
+            return response.json()["encrypted"]
+
+
+@dataclass(slots=True, frozen=True)
 class ParsedCookies:
     """解析后的 cookie 数据"""
 
@@ -41,13 +106,36 @@ class CookieCloudClient:
         self.url = url.rstrip("/")
         self.uuid = uuid
         self.password = password
+        self._session = None
+
+    def _get_session(self):
+        """
+        获取复用的 requests Session（禁用 SSL 验证以支持自签名证书）。
 
-    def fetch_cookies(self, target_domain: str = ".duolainc.com") -> ParsedCookies:
+        多次刷新之间复用连接池，避免每次都重新建立 TCP/TLS 连接。
+        """
+        if self._session is None:
+            # 只忽略发往 CookieCloud 服务的未验证 HTTPS 告警，不影响其他请求
+            host = re.escape(urlparse(self.url).hostname or "")
+            warnings.filterwarnings(
+                "ignore",
+                message=f"Unverified HTTPS request is being made to host '{host}'",
+                category=urllib3.exceptions.InsecureRequestWarning,
+            )
+
+            self._session = requests.Session()
+            self._session.verify = False
+        return self._session
+
+    def fetch_cookies(
+        self, target_domain: Union[str, tuple[str, ...]] = ".duolainc.com"
+    ) -> ParsedCookies:
         """
         从 CookieCloud 获取并解析 cookie。
 
         Args:
-            target_domain: 目标域名
+            target_domain: 目标域名，或预先计算好的候选域名元组
+                （按优先级排列，首项为配置的目标域名，见 domain_variants）
 
         Returns:
             ParsedCookies 包含解析后的认证信息
@@ -56,105 +144,71 @@ class CookieCloudClient:
             ConnectionError: 连接 CookieCloud 失败
             ValueError: Cookie 数据格式错误或缺少必要字段
         """
-        # 延迟导入，避免未安装时影响其他功能
-        try:
-            from PyCookieCloud import PyCookieCloud
-        except ImportError:
+        if PyCookieCloud is None:
             raise ImportError(
                 "PyCookieCloud 未安装，请运行: uv add PyCookieCloud"
             )
 
-        logger.info(f"从 CookieCloud 获取 cookie (目标域名: {target_domain})")
-
-        # 临时禁用 SSL 验证以解决自签名证书问题
-        import urllib3
+        if isinstance(target_domain, str):
+            target_domains = domain_variants(target_domain)
+        else:
+            target_domains = target_domain
+            target_domain = target_domains[0]
 
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        logger.info("从 CookieCloud 获取 cookie (目标域名: {})", target_domain)
 
         try:
-            # 使用 monkey-patch 禁用 SSL 验证
-            import requests
-
-            original_get = requests.get
-            original_session_get = requests.Session.get
-
-            def get_no_verify(*args, **kwargs):
-                kwargs["verify"] = False
-                return original_get(*args, **kwargs)
-
-            def session_get_no_verify(self, *args, **kwargs):
-                kwargs["verify"] = False
-                return original_session_get(self, *args, **kwargs)
-
-            requests.get = get_no_verify
-            requests.Session.get = session_get_no_verify
-
-            try:
-                client = PyCookieCloud(self.url, self.uuid, self.password)
-                decrypted_data = client.get_decrypted_data()
-            finally:
-                # 恢复原始方法
-                requests.get = original_get
-                requests.Session.get = original_session_get
+            client = _SessionCookieCloud(
+                self.url, self.uuid, self.password, self._get_session()
+            )
+            decrypted_data = client.get_decrypted_data()
 
         except Exception as e:
-            logger.error(f"CookieCloud 连接失败: {e}")
+            logger.error("CookieCloud 连接失败: {}", e)
             raise ConnectionError(f"CookieCloud 连接失败: {e}")
 
         if not decrypted_data:
             raise ConnectionError("CookieCloud 返回数据为空")
 
-        logger.info(f"获取到 {len(decrypted_data)} 个域名的 cookie")
-        logger.debug(f"可用域名: {list(decrypted_data.keys())}")
+        logger.info("获取到 {} 个域名的 cookie", len(decrypted_data))
+        logger.opt(lazy=True).debug(
+            "可用域名: {}", lambda: list(decrypted_data.keys())
+        )
 
         # 提取目标域名的 cookie（支持带/不带前导点的域名格式）
-        domain_cookies = self._find_domain_cookies(decrypted_data, target_domain)
+        domain_cookies = self._find_domain_cookies(decrypted_data, target_domains)
         if not domain_cookies:
             available = list(decrypted_data.keys())
             raise ValueError(
                 f"未找到域名 '{target_domain}' 的 cookie，可用域名: {available}"
             )
 
-        logger.info(f"找到 {len(domain_cookies)} 个匹配的 cookie")
+        logger.info("找到 {} 个匹配的 cookie", len(domain_cookies))
 
         # 解析 cookie
         return self._parse_cookies(domain_cookies)
 
     def _find_domain_cookies(
-        self, data: dict[str, list], target_domain: str
+        self, data: dict[str, list], target_domains: tuple[str, ...]
     ) -> list[dict]:
         """
         在 CookieCloud 数据中查找匹配的域名 cookie。
 
-        支持多种域名格式匹配：
-        - 精确匹配
-        - 带/不带前导点的变体（.duolainc.com vs duolainc.com）
+        按顺序尝试候选域名，通常为目标域名及其带/不带前导点的变体
+        （.duolainc.com vs duolainc.com）。
 
         Args:
             data: CookieCloud 返回的数据 {domain: [cookies]}
-            target_domain: 目标域名
+            target_domains: 候选域名
 
         Returns:
-            匹配的 cookie 列表
+            首个存在的候选域名的 cookie 列表，均不存在时返回空列表
         """
-        # 1. 精确匹配
-        if target_domain in data:
-            logger.debug(f"精确匹配域名: {target_domain}")
-            return data[target_domain]
-
-        # 2. 尝试变体匹配
-        # 如果目标是 .duolainc.com，也尝试 duolainc.com
-        # 如果目标是 duolainc.com，也尝试 .duolainc.com
-        if target_domain.startswith("."):
-            variant = target_domain[1:]  # 去掉前导点
-        else:
-            variant = "." + target_domain  # 添加前导点
-
-        if variant in data:
-            logger.debug(f"变体匹配域名: {variant} (目标: {target_domain})")
-            return data[variant]
+        for domain in target_domains:
+            if domain in data:
+                logger.debug("匹配域名: {}", domain)
+                return data[domain]
 
-        # 3. 未找到匹配
         return []
 
     def _parse_cookies(self, cookies: list[dict]) -> ParsedCookies:
@@ -170,33 +224,24 @@ class CookieCloudClient:
         Raises:
             ValueError: 缺少必要的 cookie 字段
         """
-        cookie_parts = []
-        authorization = None
-        jwt_exp = None
+        # 同名 cookie 以最后出现的为准
+        name_values = {
+            c["name"]: c["value"] for c in cookies if c.get("name") and c.get("value")
+        }
 
-        for cookie in cookies:
-            name = cookie.get("name", "")
-            value = cookie.get("value", "")
-
-            if not name or not value:
-                continue
-
-            cookie_parts.append(f"{name}={value}")
-
-            # 提取 PROD_AUTH_TOKEN
-            if name == "PROD_AUTH_TOKEN":
-                authorization = value
-                jwt_exp = self._extract_jwt_exp(value)
-                logger.info(f"找到 PROD_AUTH_TOKEN (exp: {jwt_exp})")
+        try:
+            authorization = name_values[PROD_AUTH_TOKEN]
+        except KeyError:
+            raise ValueError("Cookie 中缺少 PROD_AUTH_TOKEN") from None
 
-        if not authorization:
-            raise ValueError("Cookie 中缺少 PROD_AUTH_TOKEN")
+        jwt_exp = self._extract_jwt_exp(authorization)
+        logger.info("找到 PROD_AUTH_TOKEN (exp: {})", jwt_exp)
 
         if not jwt_exp:
             raise ValueError("无法从 PROD_AUTH_TOKEN 解析过期时间")
 
-        cookie_string = "; ".join(cookie_parts)
-        logger.info(f"Cookie 字符串长度: {len(cookie_string)}")
+        cookie_string = "; ".join(f"{k}={v}" for k, v in name_values.items())
+        logger.info("Cookie 字符串长度: {}", len(cookie_string))
 
         return ParsedCookies(
             authorization=authorization,
@@ -215,30 +260,25 @@ class CookieCloudClient:
             过期时间戳（秒），解析失败返回 None
         """
         try:
-            # JWT 格式: header.payload.signature
-            parts = jwt_token.split(".")
-            if len(parts) != 3:
-                logger.warning(f"JWT 格式错误，应为 3 部分，实际为 {len(parts)} 部分")
+            # JWT 格式: header.payload.signature，只需取出中间的 payload
+            _, _, rest = jwt_token.partition(".")
+            payload_b64, sep, signature = rest.partition(".")
+            if not sep or "." in signature:
+                logger.warning("JWT 格式错误，应为 header.payload.signature 3 部分")
                 return None
 
-            # Base64 解码 payload
-            payload_b64 = parts[1]
-            # 添加必要的填充
-            padding = 4 - len(payload_b64) % 4
-            if padding != 4:
-                payload_b64 += "=" * padding
-
-            payload_json = base64.b64decode(payload_b64)
+            # JWT 使用 URL 安全的 Base64 编码，多余的填充会被忽略
+            payload_json = base64.urlsafe_b64decode(payload_b64 + "===")
             payload = json.loads(payload_json)
 
             exp = payload.get("exp")
             if exp:
-                logger.debug(f"JWT exp: {exp}")
+                logger.debug("JWT exp: {}", exp)
                 return int(exp)
 
             logger.warning("JWT payload 中缺少 exp 字段")
             return None
 
         except Exception as e:
-            logger.error(f"解析 JWT 失败: {e}")
+            logger.error("解析 JWT 失败: {}", e)
             return None